@@ -355,18 +355,18 @@ class TANAWAnomalyDetector:
                     "count": duplicates
                 })
             
-            # Data type anomalies
-            for col in df.columns:
-                if df[col].dtype == 'object':
-                    # Check for mixed data types
-                    numeric_count = pd.to_numeric(df[col], errors='coerce').notna().sum()
-                    if numeric_count > 0 and numeric_count < len(df[col]):
-                        anomalies["data_quality_issues"].append({
-                            "type": "mixed_data_types",
-                            "message": f"Column '{col}' has mixed data types",
-                            "severity": "low",
-                            "column": col
-                        })
+            # Data type anomalies (only object columns can hold mixed types)
+            object_cols = df.columns[(df.dtypes == object).to_numpy()]
+            for col in object_cols:
+                # Check for mixed data types
+                numeric_count = pd.to_numeric(df[col], errors='coerce').notna().sum()
+                if numeric_count > 0 and numeric_count < len(df):
+                    anomalies["data_quality_issues"].append({
+                        "type": "mixed_data_types",
+                        "message": f"Column '{col}' has mixed data types",
+                        "severity": "low",
+                        "column": col
+                    })
         
         except Exception as e:
             logger.error(f"Error detecting general anomalies: {str(e)}")
@@ -416,18 +416,19 @@ class TANAWAnomalyDetector:
                 return anomalies
             
             # Convert date column
-            df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-            df_with_date = df.dropna(subset=['Date'])
+            dates = pd.to_datetime(df['Date'], errors='coerce')
+            mask = dates.notna().to_numpy()
             
-            if len(df_with_date) < 30:  # Need at least 30 days
+            if mask.sum() < 30:  # Need at least 30 days
                 return anomalies
             
             # Group by day of week and detect anomalies
-            df_with_date['day_of_week'] = df_with_date['Date'].dt.dayofweek
-            daily_avg = df_with_date.groupby('day_of_week')[value_column].mean()
+            values = df.loc[mask, value_column]
+            day_of_week = dates[mask].dt.dayofweek
+            daily_avg = values.groupby(day_of_week.to_numpy()).mean().rename_axis('day_of_week')
             
             # Detect unusual day-of-week patterns
-            overall_avg = df_with_date[value_column].mean()
+            overall_avg = values.mean()
             unusual_days = daily_avg[abs(daily_avg - overall_avg) > overall_avg * 0.3]
             
             if len(unusual_days) > 0:
@@ -452,18 +453,21 @@ class TANAWAnomalyDetector:
                 return anomalies
             
             # Convert date column
-            df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-            df_with_date = df.dropna(subset=['Date'])
+            dates = pd.to_datetime(df['Date'], errors='coerce')
+            mask = dates.notna().to_numpy()
             
-            if len(df_with_date) < 30:
+            if mask.sum() < 30:
                 return anomalies
             
+            dates = dates[mask]
+            customers = df.loc[mask, 'Customer']
+            
             # Find customers who haven't been active recently
-            latest_date = df_with_date['Date'].max()
+            latest_date = dates.max()
             cutoff_date = latest_date - timedelta(days=30)
             
-            recent_customers = df_with_date[df_with_date['Date'] > cutoff_date]['Customer'].unique()
-            all_customers = df_with_date['Customer'].unique()
+            recent_customers = customers[(dates > cutoff_date).to_numpy()].unique()
+            all_customers = customers.unique()
             
             churned_customers = set(all_customers) - set(recent_customers)
             
@@ -5,7 +5,6 @@ Handles: Product Performance, Location-based Sales, Category Analysis
 """
 
 import pandas as pd
-import numpy as np
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from chart_styling import TANAWChartStyling
@@ -270,11 +269,7 @@ class TANAWBarChartGenerator:
             
         except Exception as e:
             print(f"❌ Error generating Product Performance chart: {e}")
-            # Try fallback methods
-            return self.fallback_handler.handle_bar_chart_fallback(
-                df, "product_performance", self.generate_product_performance,
-                product_col=product_col, sales_col=sales_col
-            )
+            return None
     
     def generate_regional_sales(self, df: pd.DataFrame, region_col: str, sales_col: str) -> Optional[Dict[str, Any]]:
         """
@@ -403,11 +398,7 @@ class TANAWBarChartGenerator:
             
         except Exception as e:
             print(f"❌ Error generating Location-based Sales chart: {e}")
-            # Try fallback methods
-            return self.fallback_handler.handle_bar_chart_fallback(
-                df, "regional_sales", self.generate_regional_sales,
-                region_col=region_col, sales_col=sales_col
-            )
+            return None
     
     def can_generate_chart(self, df: pd.DataFrame, chart_type: str) -> Dict[str, Any]:
         """
@@ -1690,19 +1681,13 @@ class TANAWBarChartGenerator:
                 # Calculate gap (negative means needs reordering)
                 grouped['gap'] = grouped[stock_col] - grouped[reorder_col]
                 
-                # Sort by gap (most urgent first - most negative)
-                grouped = grouped.sort_values('gap', ascending=True)
-                
-                # Show all items or top 15 that need reordering
-                if len(grouped) > 15:
-                    grouped = grouped.head(15)
+                # Show all items or top 15 that need reordering (most urgent first - most negative gap)
+                grouped = grouped.nsmallest(15, 'gap')
             else:
                 # If no reorder column, just show stock levels
                 # Sum all stock quantities per item
                 grouped = chart_df.groupby(item_col)[stock_col].sum().reset_index()
-                grouped = grouped.sort_values(stock_col, ascending=True)  # Lowest stock first
-                if len(grouped) > 15:
-                    grouped = grouped.head(15)
+                grouped = grouped.nsmallest(15, stock_col)  # Lowest stock first
             
             # Generate dynamic labels
             item_label = self._generate_smart_labels(item_col)
@@ -12,10 +12,12 @@ Features:
 """
 
 import json
+import logging
 import sqlite3
 import os
 import hashlib
 import time
+import random
 import threading
 from typing import Dict, List, Tuple, Any, Optional, Union, Callable
 from dataclasses import dataclass, asdict
@@ -28,7 +30,9 @@ import uuid
 # Import existing configuration
 from config_manager import get_config
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+@dataclass(slots=True)
 class CacheEntry:
     """Represents a cache entry."""
     analysis_id: str
@@ -41,7 +45,7 @@ class CacheEntry:
     last_accessed: str
     size_bytes: int
 
-@dataclass
+@dataclass(slots=True)
 class BackgroundJob:
     """Represents a background job."""
     job_id: str
@@ -56,8 +60,9 @@ class BackgroundJob:
     error_message: Optional[str]
     retry_count: int
     max_retries: int
+    next_attempt_at: float = 0.0  # epoch seconds; retries wait out their backoff
 
-@dataclass
+@dataclass(slots=True)
 class CacheResult:
     """Represents a cache operation result."""
     success: bool
@@ -66,7 +71,7 @@ class CacheResult:
     processing_time_seconds: float = 0.0
     error_message: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class JobResult:
     """Represents a background job result."""
     success: bool
@@ -100,12 +105,15 @@ class CacheManager:
         self.max_cache_entries = getattr(self.config, 'max_cache_entries', 1000)
         self.background_workers = getattr(self.config, 'background_workers', 2)
         self.job_timeout_seconds = getattr(self.config, 'job_timeout_seconds', 300)
+        self.retry_backoff_base_seconds = getattr(self.config, 'retry_backoff_base_seconds', 2.0)
+        self.retry_backoff_max_seconds = getattr(self.config, 'retry_backoff_max_seconds', 60.0)
         
         # Threading
         self.lock = threading.Lock()
         self.job_queue = []
         self.workers = []
         self.stop_workers = False
+        self._local = threading.local()  # per-thread database connection
         
         # Metrics tracking
         self.metrics = {
@@ -130,9 +138,13 @@ class CacheManager:
     def _initialize_cache_database(self):
         """Initialize the cache database."""
         try:
-            with sqlite3.connect(self.cache_db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
+                # WAL lets the request threads read while a worker writes; the
+                # journal mode is stored in the database file, so set it once here
+                cursor.execute('PRAGMA journal_mode=WAL')
+                
                 # Create cache table
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS cache_entries (
@@ -168,7 +180,10 @@ class CacheManager:
                 ''')
                 
                 # Create indexes for performance
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_analysis_id ON cache_entries(analysis_id)')
+                # (analysis_id, last_accessed) serves both analysis_id lookups and the
+                # latest-entry query without a sort; it supersedes idx_analysis_id
+                cursor.execute('DROP INDEX IF EXISTS idx_analysis_id')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_analysis_last_accessed ON cache_entries(analysis_id, last_accessed)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_expires_at ON cache_entries(expires_at)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_last_accessed ON cache_entries(last_accessed)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_job_status ON background_jobs(status)')
@@ -177,9 +192,27 @@ class CacheManager:
                 conn.commit()
                 
         except Exception as e:
-            print(f"⚠️ Error initializing cache database: {e}")
+            logger.warning("⚠️ Error initializing cache database: %s", e)
             raise
     
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Return this thread's cache database connection, opening it on first use.
+        
+        sqlite3 connections can't be shared across threads, so each worker and
+        request thread keeps its own; it is released with the thread. Reusing
+        it skips the open and PRAGMA per call and keeps the connection's
+        prepared-statement cache warm across calls.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.cache_db_path, cached_statements=256)
+            # Cache rows can be rebuilt, so an fsync per WAL checkpoint (not per
+            # commit) is enough durability
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+    
     def _start_background_workers(self):
         """Start background workers for job processing."""
         try:
@@ -188,7 +221,7 @@ class CacheManager:
                 worker.start()
                 self.workers.append(worker)
         except Exception as e:
-            print(f"⚠️ Error starting background workers: {e}")
+            logger.warning("⚠️ Error starting background workers: %s", e)
     
     def _worker_loop(self):
         """Background worker loop for processing jobs."""
@@ -197,10 +230,13 @@ class CacheManager:
                 job = None
                 with self.lock:
                     if self.job_queue:
-                        # Get highest priority job
-                        self.job_queue.sort(key=lambda x: x.priority)
-                        job = self.job_queue.pop(0)
-                        self.metrics['queue_length'] = len(self.job_queue)
+                        # Get highest priority job that is not backing off
+                        now = time.time()
+                        ready = [j for j in self.job_queue if j.next_attempt_at <= now]
+                        if ready:
+                            job = min(ready, key=lambda x: x.priority)
+                            self.job_queue.remove(job)
+                            self.metrics['queue_length'] = len(self.job_queue)
                 
                 if job:
                     self._process_job(job)
@@ -208,7 +244,7 @@ class CacheManager:
                     time.sleep(1)  # Wait for jobs
                     
             except Exception as e:
-                print(f"⚠️ Error in worker loop: {e}")
+                logger.warning("⚠️ Error in worker loop: %s", e)
                 self.metrics['worker_errors'] += 1
                 time.sleep(5)  # Wait longer on error
     
@@ -228,7 +264,7 @@ class CacheManager:
             elif job.job_type == 'gpt_reevaluation':
                 result = self._process_gpt_reevaluation(job)
             else:
-                raise Exception(f"Unknown job type: {job.job_type}")
+                raise ValueError(f"Unknown job type: {job.job_type}")
             
             # Update job status
             if result.success:
@@ -245,6 +281,7 @@ class CacheManager:
                 if job.retry_count < job.max_retries:
                     job.status = 'pending'
                     job.started_at = None
+                    job.next_attempt_at = time.time() + self._retry_delay(job.retry_count)
                     with self.lock:
                         self.job_queue.append(job)
                         self.metrics['queue_length'] = len(self.job_queue)
@@ -259,6 +296,12 @@ class CacheManager:
             self.metrics['worker_errors'] += 1
             self._update_job_status(job)
     
+    def _retry_delay(self, retry_count: int) -> float:
+        """Exponential backoff with jitter so failed jobs don't retry in lockstep."""
+        delay = min(self.retry_backoff_max_seconds,
+                    self.retry_backoff_base_seconds * (2 ** retry_count))
+        return delay * (0.5 + random.random())
+    
     def _process_full_file_rerun(self, job: BackgroundJob) -> JobResult:
         """Process full file rerun job."""
         start_time = datetime.now()
@@ -356,6 +399,9 @@ class CacheManager:
             if self._is_cache_full():
                 self._evict_lru_entries()
             
+            # Serialize once; the same payload is sized and stored
+            data_json = self._serialize_data(data)
+            
             # Create cache entry
             cache_entry = CacheEntry(
                 analysis_id=analysis_id,
@@ -366,11 +412,11 @@ class CacheManager:
                 expires_at=(datetime.now() + timedelta(hours=self.cache_ttl_hours)).isoformat(),
                 access_count=0,
                 last_accessed=datetime.now().isoformat(),
-                size_bytes=self._calculate_size(data)
+                size_bytes=self._calculate_size(data, data_json)
             )
             
             # Store in database
-            self._store_cache_entry(cache_entry)
+            self._store_cache_entry(cache_entry, data_json)
             
             processing_time = (datetime.now() - start_time).total_seconds()
             self.metrics['processing_time_ms'] = processing_time * 1000
@@ -394,7 +440,7 @@ class CacheManager:
         start_time = datetime.now()
         
         try:
-            with sqlite3.connect(self.cache_db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 if cache_key:
@@ -473,7 +519,7 @@ class CacheManager:
         start_time = datetime.now()
         
         try:
-            with sqlite3.connect(self.cache_db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 if cache_key:
@@ -549,7 +595,7 @@ class CacheManager:
         start_time = datetime.now()
         
         try:
-            with sqlite3.connect(self.cache_db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT status, error_message, completed_at
@@ -591,36 +637,39 @@ class CacheManager:
         try:
             # Create hash of data for cache key
             data_str = json.dumps(data, sort_keys=True)
-            hash_obj = hashlib.md5(data_str.encode())
+            hash_obj = hashlib.blake2b(data_str.encode(), digest_size=16)
             return hash_obj.hexdigest()
         except Exception as e:
             return str(uuid.uuid4())
     
-    def _calculate_size(self, data: Dict[str, Any]) -> int:
-        """Calculate size of data in bytes."""
+    def _serialize_data(self, data: Dict[str, Any]) -> Optional[str]:
+        """Serialize cache data to JSON, or None if it is not serializable."""
         try:
-            data_str = json.dumps(data)
-            return len(data_str.encode('utf-8'))
+            return json.dumps(data)
         except Exception:
-            return 0
+            return None
+    
+    def _calculate_size(self, data: Dict[str, Any], data_json: Optional[str] = None) -> int:
+        """Calculate size of data in bytes."""
+        if data_json is None:
+            data_json = self._serialize_data(data)
+            if data_json is None:
+                return 0
+        return len(data_json.encode('utf-8'))
     
     def _is_cache_full(self) -> bool:
         """Check if cache is full."""
         try:
-            with sqlite3.connect(self.cache_db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
-                # Check entry count
-                cursor.execute('SELECT COUNT(*) FROM cache_entries')
-                entry_count = cursor.fetchone()[0]
+                # Entry count and total size in one scan
+                cursor.execute('SELECT COUNT(*), TOTAL(size_bytes) FROM cache_entries')
+                entry_count, total_size = cursor.fetchone()
                 
                 if entry_count >= self.max_cache_entries:
                     return True
                 
-                # Check size
-                cursor.execute('SELECT SUM(size_bytes) FROM cache_entries')
-                total_size = cursor.fetchone()[0] or 0
-                
                 if total_size >= self.max_cache_size_mb * 1024 * 1024:
                     return True
                 
@@ -632,7 +681,7 @@ class CacheManager:
     def _evict_lru_entries(self):
         """Evict least recently used entries."""
         try:
-            with sqlite3.connect(self.cache_db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 # Get LRU entries to evict
@@ -645,22 +694,23 @@ class CacheManager:
                 
                 entries_to_evict = cursor.fetchall()
                 
-                for analysis_id, cache_key in entries_to_evict:
-                    cursor.execute('''
-                        DELETE FROM cache_entries
-                        WHERE analysis_id = ? AND cache_key = ?
-                    ''', (analysis_id, cache_key))
-                    self.metrics['cache_evictions'] += 1
+                cursor.executemany('''
+                    DELETE FROM cache_entries
+                    WHERE analysis_id = ? AND cache_key = ?
+                ''', entries_to_evict)
+                self.metrics['cache_evictions'] += len(entries_to_evict)
                 
                 conn.commit()
                 
         except Exception as e:
-            print(f"⚠️ Error evicting LRU entries: {e}")
+            logger.warning("⚠️ Error evicting LRU entries: %s", e)
     
-    def _store_cache_entry(self, entry: CacheEntry):
+    def _store_cache_entry(self, entry: CacheEntry, data_json: Optional[str] = None):
         """Store cache entry in database."""
         try:
-            with sqlite3.connect(self.cache_db_path) as conn:
+            if data_json is None:
+                data_json = json.dumps(entry.data)
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     INSERT OR REPLACE INTO cache_entries
@@ -668,19 +718,19 @@ class CacheManager:
                      access_count, last_accessed, size_bytes)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ''', (
-                    entry.analysis_id, entry.cache_key, json.dumps(entry.data),
+                    entry.analysis_id, entry.cache_key, data_json,
                     json.dumps(entry.metadata), entry.created_at, entry.expires_at,
                     entry.access_count, entry.last_accessed, entry.size_bytes
                 ))
                 conn.commit()
                 
         except Exception as e:
-            print(f"⚠️ Error storing cache entry: {e}")
+            logger.warning("⚠️ Error storing cache entry: %s", e)
     
     def _remove_cache_entry(self, analysis_id: str, cache_key: str):
         """Remove cache entry from database."""
         try:
-            with sqlite3.connect(self.cache_db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     DELETE FROM cache_entries
@@ -689,12 +739,12 @@ class CacheManager:
                 conn.commit()
                 
         except Exception as e:
-            print(f"⚠️ Error removing cache entry: {e}")
+            logger.warning("⚠️ Error removing cache entry: %s", e)
     
     def _store_job(self, job: BackgroundJob):
         """Store job in database."""
         try:
-            with sqlite3.connect(self.cache_db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     INSERT OR REPLACE INTO background_jobs
@@ -709,12 +759,12 @@ class CacheManager:
                 conn.commit()
                 
         except Exception as e:
-            print(f"⚠️ Error storing job: {e}")
+            logger.warning("⚠️ Error storing job: %s", e)
     
     def _update_job_status(self, job: BackgroundJob):
         """Update job status in database."""
         try:
-            with sqlite3.connect(self.cache_db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     UPDATE background_jobs
@@ -727,7 +777,7 @@ class CacheManager:
                 conn.commit()
                 
         except Exception as e:
-            print(f"⚠️ Error updating job status: {e}")
+            logger.warning("⚠️ Error updating job status: %s", e)
     
     def _update_cache_hit_rate(self):
         """Update cache hit rate metric."""
@@ -774,11 +824,11 @@ class CacheManager:
             }
             
             # In a real implementation, you would send these to your metrics system
-            print(f"📊 Cache manager metrics: {metrics}")
+            logger.info("📊 Cache manager metrics: %s", metrics)
             return metrics
             
         except Exception as e:
-            print(f"⚠️ Error emitting cache manager metrics: {e}")
+            logger.warning("⚠️ Error emitting cache manager metrics: %s", e)
             return {"cache.metrics_error": str(e)}
     
     def close(self):
@@ -787,8 +837,13 @@ class CacheManager:
             self.stop_workers = True
             for worker in self.workers:
                 worker.join(timeout=5)
+            
+            conn = getattr(self._local, 'conn', None)
+            if conn is not None:
+                conn.close()
+                self._local.conn = None
         except Exception as e:
-            print(f"⚠️ Error closing cache manager: {e}")
+            logger.warning("⚠️ Error closing cache manager: %s", e)
 
 # Global cache manager instance
 cache_manager = CacheManager()
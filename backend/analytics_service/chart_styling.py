@@ -4,6 +4,9 @@
 class TANAWChartStyling:
     """Chart styling configuration for TANAW analytics"""
     
+    # Chart.js options shared by the customer and finance charts (read-only; never mutate)
+    CHART_CONFIG = {'maintainAspectRatio': False, 'responsive': True}
+    
     def __init__(self):
         self.colors = {
             'primary': '#3B82F6',
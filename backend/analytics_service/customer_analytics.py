@@ -8,6 +8,7 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+from chart_styling import TANAWChartStyling
 
 @dataclass
 class CustomerChart:
@@ -27,6 +28,8 @@ class TANAWCustomerAnalytics:
     Updated: Uses flexible column detection for better compatibility.
     """
     
+    CHART_CONFIG = TANAWChartStyling.CHART_CONFIG
+    
     def __init__(self):
         # Customer-specific column patterns
         self.customer_patterns = {
@@ -219,7 +222,7 @@ class TANAWCustomerAnalytics:
                     'labels': segment_counts['segment'].tolist(),
                     'values': segment_counts['count'].tolist()
                 },
-                config={'maintainAspectRatio': False, 'responsive': True}
+                config=self.CHART_CONFIG
             )
             
         except Exception as e:
@@ -250,7 +253,7 @@ class TANAWCustomerAnalytics:
             
             # Count purchases per customer
             purchase_freq = df.groupby(customer_col).size().reset_index(name='Purchase_Count')
-            purchase_freq = purchase_freq.sort_values('Purchase_Count', ascending=False).head(20)
+            purchase_freq = purchase_freq.nlargest(20, 'Purchase_Count')
             
             print(f"   ✅ Generated purchase frequency for {len(purchase_freq)} customers")
             print(f"   📊 Frequency range: {purchase_freq['Purchase_Count'].min()} to {purchase_freq['Purchase_Count'].max()} purchases")
@@ -268,7 +271,7 @@ class TANAWCustomerAnalytics:
                     'x_label': 'Customer',
                     'y_label': 'Number of Purchases'
                 },
-                config={'maintainAspectRatio': False, 'responsive': True}
+                config=self.CHART_CONFIG
             )
             
         except Exception as e:
@@ -304,7 +307,10 @@ class TANAWCustomerAnalytics:
             
             # Calculate CLV (total revenue per customer)
             clv = df.groupby(customer_col)[revenue_col].sum().reset_index(name='CLV')
-            clv = clv.sort_values('CLV', ascending=False).head(20)
+            if pd.api.types.is_numeric_dtype(clv['CLV']):
+                clv = clv.nlargest(20, 'CLV')
+            else:
+                clv = clv.sort_values('CLV', ascending=False).head(20)
             
             print(f"   ✅ Generated CLV for {len(clv)} customers")
             print(f"   📊 CLV range: ₱{clv['CLV'].min():,.0f} to ₱{clv['CLV'].max():,.0f}")
@@ -322,7 +328,7 @@ class TANAWCustomerAnalytics:
                     'x_label': 'Customer',
                     'y_label': 'Total Revenue (₱)'
                 },
-                config={'maintainAspectRatio': False, 'responsive': True}
+                config=self.CHART_CONFIG
             )
             
         except Exception as e:
@@ -380,7 +386,7 @@ class TANAWCustomerAnalytics:
                     'x': segment_data['segment'].tolist(),
                     'y': segment_data[amount_col].tolist()
                 },
-                config={'maintainAspectRatio': False, 'responsive': True}
+                config=self.CHART_CONFIG
             )
             
         except Exception as e:
@@ -406,15 +412,14 @@ class TANAWCustomerAnalytics:
                 print("⚠️ Missing required columns for LTV analysis")
                 return None
             
-            # Convert date
-            df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
-            
             # Calculate customer LTV
             customer_ltv = df.groupby(customer_col)[amount_col].sum().reset_index()
-            customer_ltv = customer_ltv.sort_values(amount_col, ascending=False)
             
             # Take top 15 customers
-            customer_ltv = customer_ltv.head(15)
+            if pd.api.types.is_numeric_dtype(customer_ltv[amount_col]):
+                customer_ltv = customer_ltv.nlargest(15, amount_col)
+            else:
+                customer_ltv = customer_ltv.sort_values(amount_col, ascending=False).head(15)
             
             return CustomerChart(
                 id='lifetime_value',
@@ -426,7 +431,7 @@ class TANAWCustomerAnalytics:
                     'x': customer_ltv[customer_col].tolist(),
                     'y': customer_ltv[amount_col].tolist()
                 },
-                config={'maintainAspectRatio': False, 'responsive': True}
+                config=self.CHART_CONFIG
             )
             
         except Exception as e:
@@ -450,13 +455,13 @@ class TANAWCustomerAnalytics:
                 return None
             
             # Convert date
-            df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+            dates = pd.to_datetime(df[date_col], errors='coerce')
             
             # Calculate last activity date for each customer
-            customer_activity = df.groupby(customer_col)[date_col].max().reset_index()
+            customer_activity = dates.groupby(df[customer_col]).max().reset_index()
             
             # Define churn risk based on recency
-            max_date = df[date_col].max()
+            max_date = dates.max()
             customer_activity['days_since_last_activity'] = (max_date - customer_activity[date_col]).dt.days
             
             # Categorize churn risk
@@ -481,7 +486,7 @@ class TANAWCustomerAnalytics:
                     'x': churn_data['churn_risk'].tolist(),
                     'y': churn_data['count'].tolist()
                 },
-                config={'maintainAspectRatio': False, 'responsive': True}
+                config=self.CHART_CONFIG
             )
             
         except Exception as e:
@@ -505,14 +510,14 @@ class TANAWCustomerAnalytics:
                 return None
             
             # Convert date
-            df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+            dates = pd.to_datetime(df[date_col], errors='coerce')
             
             # Simulate satisfaction scores based on transaction amounts
             # Higher amounts = higher satisfaction
-            df['satisfaction_score'] = np.clip(df[amount_col] / df[amount_col].mean() * 5, 1, 5)
+            satisfaction_score = np.clip(df[amount_col] / df[amount_col].mean() * 5, 1, 5).rename('satisfaction_score')
             
             # Group by month and calculate average satisfaction
-            monthly_satisfaction = df.groupby(df[date_col].dt.to_period('M'))['satisfaction_score'].mean().reset_index()
+            monthly_satisfaction = satisfaction_score.groupby(dates.dt.to_period('M')).mean().reset_index()
             monthly_satisfaction[date_col] = monthly_satisfaction[date_col].astype(str)
             
             return CustomerChart(
@@ -525,7 +530,7 @@ class TANAWCustomerAnalytics:
                     'x': monthly_satisfaction[date_col].tolist(),
                     'y': monthly_satisfaction['satisfaction_score'].tolist()
                 },
-                config={'maintainAspectRatio': False, 'responsive': True}
+                config=self.CHART_CONFIG
             )
             
         except Exception as e:
@@ -549,10 +554,10 @@ class TANAWCustomerAnalytics:
                 return None
             
             # Convert date
-            df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+            dates = pd.to_datetime(df[date_col], errors='coerce')
             
             # Find first activity date for each customer
-            customer_first_activity = df.groupby(customer_col)[date_col].min().reset_index()
+            customer_first_activity = dates.groupby(df[customer_col]).min().reset_index()
             
             # Group by month to get new customer acquisition
             customer_first_activity['acquisition_month'] = customer_first_activity[date_col].dt.to_period('M')
@@ -570,7 +575,7 @@ class TANAWCustomerAnalytics:
                     'x': acquisition_data[date_col].tolist(),
                     'y': acquisition_data['new_customers'].tolist()
                 },
-                config={'maintainAspectRatio': False, 'responsive': True}
+                config=self.CHART_CONFIG
             )
             
         except Exception as e:
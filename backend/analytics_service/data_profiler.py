@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import pandas as pd
-import numpy as np
 from typing import Dict, Any, List, Optional
 
 
@@ -62,11 +61,15 @@ class TANAWDataProfiler:
 
         total_rows = len(df) if len(df) > 0 else 1
 
+        # Frame-wide reductions instead of one pass per column
+        null_ratios = df.isna().mean()
+        unique_counts = df.nunique(dropna=True)
+
         for col in df.columns:
             s = df[col]
             dtype = str(s.dtype)
-            null_pct = float(s.isna().mean())
-            uniq_ratio = float(s.nunique(dropna=True) / total_rows)
+            null_pct = float(null_ratios[col])
+            uniq_ratio = float(unique_counts[col] / total_rows)
             sample_vals = self._sample_values(s)
 
             profile["column_profile"][col] = {
@@ -23,6 +23,11 @@ class TANAWDomainDetector:
     
     def __init__(self):
         self.domain_patterns = self._initialize_domain_patterns()
+        # Column patterns compiled once; detect_domain tests every column against them
+        self.column_regexes = {
+            domain: [(pattern, re.compile(pattern)) for pattern in patterns['column_patterns']]
+            for domain, patterns in self.domain_patterns.items()
+        }
         self.analytics_registry = self._initialize_analytics_registry()
     
     def _initialize_domain_patterns(self) -> Dict[str, Dict]:
@@ -123,6 +128,9 @@ class TANAWDomainDetector:
         original_columns = [str(col).lower() for col in df.columns]
         mapped_columns = list(column_mapping.keys())
         
+        # Lowercase every candidate column once for all domains
+        scan_columns = [(col, col.lower()) for col in original_columns + mapped_columns]
+        
         # Calculate domain scores
         domain_scores = {}
         domain_indicators = {}
@@ -133,22 +141,22 @@ class TANAWDomainDetector:
             
             # Check primary indicators (higher weight)
             for indicator in patterns['primary_indicators']:
-                for col in original_columns + mapped_columns:
-                    if indicator in col.lower():
+                for col, col_lower in scan_columns:
+                    if indicator in col_lower:
                         score += 3
                         indicators.append(f"Primary: {indicator} in {col}")
             
             # Check secondary indicators (lower weight)
             for indicator in patterns['secondary_indicators']:
-                for col in original_columns + mapped_columns:
-                    if indicator in col.lower():
+                for col, col_lower in scan_columns:
+                    if indicator in col_lower:
                         score += 1
                         indicators.append(f"Secondary: {indicator} in {col}")
             
             # Check column patterns
-            for pattern in patterns['column_patterns']:
-                for col in original_columns + mapped_columns:
-                    if re.search(pattern, col.lower()):
+            for pattern, regex in self.column_regexes[domain]:
+                for col, col_lower in scan_columns:
+                    if regex.search(col_lower):
                         score += 2
                         indicators.append(f"Pattern: {pattern} matches {col}")
             
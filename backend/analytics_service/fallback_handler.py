@@ -1,17 +1,25 @@
 # fallback_handler.py
 # Fallback Handler for TANAW Analytics
 
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
 class TANAWFallbackHandler:
     """Handles fallback operations when primary services fail"""
     
+    __slots__ = ('fallback_enabled', 'log_errors', '_active_chains')
+    
     def __init__(self):
         self.fallback_enabled = True
         self.log_errors = True
+        self._active_chains = threading.local()  # chart types whose chain is running on this thread
     
     def handle_analysis_fallback(self, error_message):
         """Handle analysis fallback when primary analysis fails"""
         if self.log_errors:
-            print(f"⚠️ Analysis fallback triggered: {error_message}")
+            logger.warning("⚠️ Analysis fallback triggered: %s", error_message)
         
         return {
             'success': False,
@@ -23,7 +31,7 @@ class TANAWFallbackHandler:
     def handle_chart_fallback(self, error_message):
         """Handle chart generation fallback"""
         if self.log_errors:
-            print(f"⚠️ Chart fallback triggered: {error_message}")
+            logger.warning("⚠️ Chart fallback triggered: %s", error_message)
         
         return {
             'success': False,
@@ -44,30 +52,67 @@ class TANAWFallbackHandler:
         """Disable fallback handling"""
         self.fallback_enabled = False
     
-    def handle_bar_chart_fallback(self, df, chart_type, generation_func, *args, **kwargs):
-        """Handle bar chart generation fallback"""
+    @staticmethod
+    def _is_successful_chart(result):
+        """Bar/line generators return a chart dict flagged status='success'."""
+        return isinstance(result, dict) and result.get('status') == 'success'
+    
+    @staticmethod
+    def _is_forecast(result):
+        """Forecast generators return a 'line_forecast' chart dict."""
+        return isinstance(result, dict) and result.get('type') == 'line_forecast'
+    
+    @staticmethod
+    def _is_present(result):
+        """Analytics modules return a chart dataclass or None."""
+        return result is not None
+    
+    def _run_chain(self, label, chart_type, methods, predicate, df, *args, **kwargs):
+        """
+        Try each fallback method in order and return the first result that
+        satisfies predicate.
+        
+        A fallback may itself fail and call back into its handler from its
+        own except block, so a chain already running for chart_type on this
+        thread is not started again.
+        """
+        active = getattr(self._active_chains, 'types', None)
+        if active is None:
+            active = self._active_chains.types = set()
+        if chart_type in active:
+            return None
+        
+        active.add(chart_type)
         try:
-            return generation_func(df, *args, **kwargs)
-        except Exception as e:
-            if self.log_errors:
-                print(f"⚠️ Bar chart fallback for {chart_type}: {e}")
+            for method in methods:
+                try:
+                    result = method(df, *args, **kwargs)
+                except Exception as e:
+                    if self.log_errors:
+                        logger.warning("⚠️ %s fallback for %s: %s", label, chart_type, e)
+                    continue
+                if predicate(result):
+                    return result
             return None
+        finally:
+            active.discard(chart_type)
+    
+    def handle_bar_chart_fallback(self, df, chart_type, fallback_methods, *args, **kwargs):
+        """Handle bar chart generation fallback"""
+        return self._run_chain("Bar chart", chart_type, fallback_methods, self._is_successful_chart,
+                               df, *args, **kwargs)
     
-    def handle_line_chart_fallback(self, df, chart_type, generation_func, *args, **kwargs):
+    def handle_line_chart_fallback(self, df, chart_type, fallback_methods, *args, **kwargs):
         """Handle line chart generation fallback"""
-        try:
-            return generation_func(df, *args, **kwargs)
-        except Exception as e:
-            if self.log_errors:
-                print(f"⚠️ Line chart fallback for {chart_type}: {e}")
-            return None
+        return self._run_chain("Line chart", chart_type, fallback_methods, self._is_successful_chart,
+                               df, *args, **kwargs)
     
-    def handle_forecast_fallback(self, df, chart_type, generation_func, *args, **kwargs):
+    def handle_forecast_fallback(self, df, chart_type, fallback_methods, *args, **kwargs):
         """Handle forecast generation fallback"""
-        try:
-            return generation_func(df, *args, **kwargs)
-        except Exception as e:
-            if self.log_errors:
-                print(f"⚠️ Forecast fallback for {chart_type}: {e}")
-            return None
-
+        return self._run_chain("Forecast", chart_type, fallback_methods, self._is_forecast,
+                               df, *args, **kwargs)
+    
+    def handle_inventory_fallback(self, df, chart_type, fallback_methods, *args, **kwargs):
+        """Handle inventory analysis fallback"""
+        return self._run_chain("Inventory", chart_type, fallback_methods, self._is_present,
+                               df, *args, **kwargs)
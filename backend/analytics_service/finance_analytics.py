@@ -8,6 +8,8 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+from chart_styling import TANAWChartStyling
+from forecast_utils import linear_fit
 
 @dataclass
 class FinanceChart:
@@ -27,6 +29,8 @@ class TANAWFinanceAnalytics:
     Updated: Uses flexible column detection to avoid sales chart duplicates.
     """
     
+    CHART_CONFIG = TANAWChartStyling.CHART_CONFIG
+    
     def __init__(self):
         # Finance-specific column patterns
         self.finance_patterns = {
@@ -284,10 +288,7 @@ class TANAWFinanceAnalytics:
                     'y_label': 'Amount (₱)',
                     'chart_subtype': 'multi_series'  # Identifies multi-line chart
                 },
-                config={
-                    'maintainAspectRatio': False,
-                    'responsive': True
-                }
+                config=self.CHART_CONFIG
             )
             
         except Exception as e:
@@ -402,8 +403,7 @@ class TANAWFinanceAnalytics:
                     'y_label': 'Profit Margin (%)'
                 },
                 config={
-                    'maintainAspectRatio': False,
-                    'responsive': True,
+                    **self.CHART_CONFIG,
                     'color_scheme': 'profit_margin'  # Frontend can use green for high, red for low
                 }
             )
@@ -495,15 +495,14 @@ class TANAWFinanceAnalytics:
                 forecast_value = np.mean(recent_values)
                 
                 # Calculate trend
-                x_values = np.arange(len(recent_values))
-                trend_coef = np.polyfit(x_values, recent_values, 1)[0]
+                trend_coef, _ = linear_fit(np.arange(len(recent_values)), recent_values)
                 
                 # Generate forecast
                 last_date = df_grouped[date_col].iloc[-1]
                 forecast_dates = pd.date_range(start=last_date + pd.Timedelta(days=1), periods=30, freq='D')
                 
                 # Forecast with trend
-                forecast_values = [forecast_value + (trend_coef * i) for i in range(1, 31)]
+                forecast_values = (forecast_value + trend_coef * np.arange(1, 31)).tolist()
                 
                 # Combine historical and forecast
                 historical_dates = df_grouped[date_col].dt.strftime('%Y-%m-%d').tolist()
@@ -535,10 +534,7 @@ class TANAWFinanceAnalytics:
                         'y_label': 'Net Cash Flow (₱)',
                         'chart_subtype': 'forecast'
                     },
-                    config={
-                        'maintainAspectRatio': False,
-                        'responsive': True
-                    }
+                    config=self.CHART_CONFIG
                 )
             else:
                 print("   ⚠️ Insufficient data for forecasting (need at least 7 days)")
@@ -571,10 +567,12 @@ class TANAWFinanceAnalytics:
             
             # Group by category and sum amounts
             expense_data = df.groupby(category_col)[amount_col].sum().reset_index()
-            expense_data = expense_data.sort_values(amount_col, ascending=False)
             
             # Take top 8 categories for pie chart
-            expense_data = expense_data.head(8)
+            if pd.api.types.is_numeric_dtype(expense_data[amount_col]):
+                expense_data = expense_data.nlargest(8, amount_col)
+            else:
+                expense_data = expense_data.sort_values(amount_col, ascending=False).head(8)
             
             return FinanceChart(
                 id='expense_breakdown',
@@ -586,7 +584,7 @@ class TANAWFinanceAnalytics:
                     'x': expense_data[category_col].tolist(),
                     'y': expense_data[amount_col].tolist()
                 },
-                config={'maintainAspectRatio': False, 'responsive': True}
+                config=self.CHART_CONFIG
             )
             
         except Exception as e:
@@ -610,8 +608,8 @@ class TANAWFinanceAnalytics:
                 return None
             
             # Convert date and group by month
-            df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
-            monthly_cashflow = df.groupby(df[date_col].dt.to_period('M'))[amount_col].sum().reset_index()
+            dates = pd.to_datetime(df[date_col], errors='coerce')
+            monthly_cashflow = df.groupby(dates.dt.to_period('M'))[amount_col].sum().reset_index()
             monthly_cashflow[date_col] = monthly_cashflow[date_col].astype(str)
             
             return FinanceChart(
@@ -624,7 +622,7 @@ class TANAWFinanceAnalytics:
                     'x': monthly_cashflow[date_col].tolist(),
                     'y': monthly_cashflow[amount_col].tolist()
                 },
-                config={'maintainAspectRatio': False, 'responsive': True}
+                config=self.CHART_CONFIG
             )
             
         except Exception as e:
@@ -668,7 +666,7 @@ class TANAWFinanceAnalytics:
                     'x': actual_data[category_col].tolist(),
                     'y': actual_data['variance'].tolist()
                 },
-                config={'maintainAspectRatio': False, 'responsive': True}
+                config=self.CHART_CONFIG
             )
             
         except Exception as e:
@@ -711,7 +709,7 @@ class TANAWFinanceAnalytics:
                     'x': profit_data[category_col].tolist(),
                     'y': profit_data['margin'].tolist()
                 },
-                config={'maintainAspectRatio': False, 'responsive': True}
+                config=self.CHART_CONFIG
             )
             
         except Exception as e:
@@ -735,25 +733,21 @@ class TANAWFinanceAnalytics:
                 return None
             
             # Convert date and group by month
-            df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
-            monthly_data = df.groupby(df[date_col].dt.to_period('M'))[amount_col].sum().reset_index()
+            dates = pd.to_datetime(df[date_col], errors='coerce')
+            monthly_data = df.groupby(dates.dt.to_period('M'))[amount_col].sum().reset_index()
             monthly_data[date_col] = monthly_data[date_col].astype(str)
             
             # Simple trend-based forecast
             if len(monthly_data) >= 3:
                 # Calculate trend
                 values = monthly_data[amount_col].values
-                trend = np.polyfit(range(len(values)), values, 1)[0]
+                trend, _ = linear_fit(np.arange(len(values)), values)
                 
                 # Generate forecast for next 3 months
                 last_value = values[-1]
-                forecast_dates = []
-                forecast_values = []
-                
-                for i in range(1, 4):
-                    forecast_date = pd.to_datetime(monthly_data[date_col].iloc[-1]) + pd.DateOffset(months=i)
-                    forecast_dates.append(forecast_date.strftime('%Y-%m'))
-                    forecast_values.append(last_value + (trend * i))
+                last_period = pd.to_datetime(monthly_data[date_col].iloc[-1])
+                forecast_dates = [(last_period + pd.DateOffset(months=i)).strftime('%Y-%m') for i in range(1, 4)]
+                forecast_values = (last_value + trend * np.arange(1, 4)).tolist()
                 
                 # Combine historical and forecast data
                 all_dates = monthly_data[date_col].tolist() + forecast_dates
@@ -769,7 +763,7 @@ class TANAWFinanceAnalytics:
                         'x': all_dates,
                         'y': all_values
                     },
-                    config={'maintainAspectRatio': False, 'responsive': True}
+                    config=self.CHART_CONFIG
                 )
             
         except Exception as e:
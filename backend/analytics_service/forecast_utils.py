@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+TANAW Forecast Utilities
+Helpers shared by the forecast generators and finance analytics
+"""
+
+import pandas as pd
+import numpy as np
+from typing import List, Tuple
+import warnings
+
+# Known pandas/Prophet noise from the forecast paths. Installed once at import
+# rather than per call, so requests never toggle the process-wide filter list.
+warnings.filterwarnings('ignore', message='Could not infer format', category=UserWarning)
+warnings.filterwarnings('ignore', category=FutureWarning, module='prophet')
+warnings.filterwarnings('ignore', category=RuntimeWarning, module='prophet')
+
+
+def format_dates(dates) -> List[str]:
+    """
+    Format a datetime Series/Index as 'YYYY-MM-DD' strings.
+    Naive datetimes go through numpy's day-resolution printer, which is
+    much cheaper than per-element strftime; tz-aware ones keep strftime
+    so the local calendar date is preserved.
+    """
+    accessor = dates.dt if isinstance(dates, pd.Series) else dates
+    if accessor.tz is not None:
+        return list(accessor.strftime('%Y-%m-%d'))
+    return np.asarray(dates, dtype='datetime64[D]').astype(str).tolist()
+
+
+def linear_fit(x, y) -> Tuple[float, float]:
+    """
+    Least-squares slope and intercept of y against x (closed form of
+    np.polyfit(x, y, 1)). When x has no spread, e.g. a single date, the
+    slope is 0 so the result is a flat line through the mean of y.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    denom = np.dot(dx, dx)
+    slope = float(np.dot(dx, y - y_mean) / denom) if denom else 0.0
+    return slope, float(y_mean - slope * x_mean)
@@ -14,11 +14,14 @@ import json
 import sqlite3
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
-from datetime import datetime
 import hashlib
+import logging
 import re
+import time
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+@dataclass(slots=True, frozen=True)
 class ColumnMapping:
     """Represents a column mapping result."""
     original_column: str
@@ -27,7 +30,7 @@ class ColumnMapping:
     reasoning: str
     source: str = "gpt"  # "gpt", "cache", "fallback"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MappingResult:
     """Complete mapping result for a dataset."""
     mappings: List[ColumnMapping]
@@ -55,6 +58,35 @@ class GPTColumnMapper:
     5. Quantity: Any count/volume (Qty_Sold, Stock_Level, Transaction_Count, etc.)
     """
     
+    # Keyword patterns for the local fallback mapper, compiled once per process
+    fallback_keywords = {
+        'Date': ['date', 'time', 'order'],
+        'Sales': ['sales', 'amount', 'revenue', 'value', 'total'],
+        'Product': ['product', 'item', 'sku', 'name'],
+        'Region': ['region', 'location', 'branch', 'store', 'city', 'area'],
+        'Quantity': ['quantity', 'qty', 'units', 'stock', 'count']
+    }
+    fallback_keyword_types = {
+        keyword: canonical_type
+        for canonical_type, keywords in fallback_keywords.items()
+        for keyword in keywords
+    }
+    # One pattern over every keyword so each column is scanned once, with
+    # a named group per canonical type so a match reports its type via
+    # lastgroup. Zero-width lookahead so overlapping keywords
+    # (e.g. "unitstock") are reported exactly like a substring test would
+    fallback_pattern = re.compile('(?=(?:' + '|'.join(
+        f"(?P<{canonical_type}>{'|'.join(keywords)})"
+        for canonical_type, keywords in fallback_keywords.items()
+    ) + '))')
+    
+    # Fallback scores keyed by column name, shared by all mapper instances
+    _fallback_score_cache: Dict[str, Tuple[Tuple[str, float, str], ...]] = {}
+    fallback_score_cache_size = 4096
+    
+    # Hashes per cache lookup query; stays under SQLite's bound-parameter limit
+    cache_lookup_batch_size = 500
+    
     def __init__(self, api_key: str, db_path: str = "tanaw_mapping_cache.db"):
         self.api_key = api_key
         self.db_path = db_path
@@ -112,7 +144,7 @@ class GPTColumnMapper:
         Returns:
             MappingResult with all mappings and metadata
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         
         try:
             # Ensure all columns are strings
@@ -137,7 +169,7 @@ class GPTColumnMapper:
             # Step 4: Validate and clean mappings
             validated_mappings = self._validate_mappings(all_mappings, columns)
             
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
             
             return MappingResult(
                 mappings=validated_mappings,
@@ -152,24 +184,35 @@ class GPTColumnMapper:
                 mappings=[],
                 total_cost=self.total_cost,
                 cache_hits=0,
-                processing_time=(datetime.now() - start_time).total_seconds(),
+                processing_time=time.perf_counter() - start_time,
                 success=False,
                 error_message=str(e)
             )
     
     def _check_cache(self, columns: List[str]) -> List[ColumnMapping]:
         """Check cache for existing mappings."""
+        column_hashes = [self._hash_column(column) for column in columns]
+        
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        cached_mappings = []
-        for column in columns:
-            column_hash = self._hash_column(column)
+        # Fetch every cached row in a few IN queries instead of one SELECT per column
+        cached_rows = {}
+        unique_hashes = list(dict.fromkeys(column_hashes))
+        for start in range(0, len(unique_hashes), self.cache_lookup_batch_size):
+            batch = unique_hashes[start:start + self.cache_lookup_batch_size]
             cursor.execute(
-                'SELECT original_column, mapped_to, confidence, reasoning FROM column_mappings WHERE column_hash = ?',
-                (column_hash,)
+                'SELECT column_hash, original_column, mapped_to, confidence, reasoning '
+                f'FROM column_mappings WHERE column_hash IN ({", ".join("?" * len(batch))})',
+                batch
             )
-            result = cursor.fetchone()
+            for row in cursor.fetchall():
+                cached_rows[row[0]] = row[1:]
+        
+        cached_mappings = []
+        hit_hashes = []
+        for column_hash in column_hashes:
+            result = cached_rows.get(column_hash)
             
             if result:
                 cached_mappings.append(ColumnMapping(
@@ -180,12 +223,14 @@ class GPTColumnMapper:
                     source="cache"
                 ))
                 self.cache_hits += 1
-                
-                # Update usage count
-                cursor.execute(
-                    'UPDATE column_mappings SET usage_count = usage_count + 1 WHERE column_hash = ?',
-                    (column_hash,)
-                )
+                hit_hashes.append((column_hash,))
+        
+        # Update usage counts (once per hit, as before)
+        if hit_hashes:
+            cursor.executemany(
+                'UPDATE column_mappings SET usage_count = usage_count + 1 WHERE column_hash = ?',
+                hit_hashes
+            )
         
         conn.commit()
         conn.close()
@@ -338,6 +383,117 @@ NOW MAP: {', '.join(columns)}
 Return ONLY valid JSON in the format above. Keep reasoning under 100 characters.
 """
     
+    def _score_fallback_column(self, column: str) -> Tuple[Tuple[str, float, str], ...]:
+        """
+        Score one column against the fallback keyword rules.
+        Returns (canonical_type, score, reasoning) for every type it matches.
+        Results depend only on the column name, so they are memoized
+        across mapper instances.
+        """
+        cached = self._fallback_score_cache.get(column)
+        if cached is not None:
+            return cached
+        
+        scores = []
+        col_lower = column.lower()
+        
+        # Single keyword scan, bucketed by canonical type. A column named
+        # exactly after a keyword ("date", "qty") can only hit that keyword,
+        # since no keyword contains another, so skip the regex for it.
+        type_hits = {}
+        exact_type = self.fallback_keyword_types.get(col_lower)
+        if exact_type is not None:
+            type_hits[exact_type] = {col_lower}
+        else:
+            for match in self.fallback_pattern.finditer(col_lower):
+                canonical_type = match.lastgroup
+                type_hits.setdefault(canonical_type, set()).add(match.group(canonical_type))
+        
+        # Date patterns (prefer transaction dates, not system metadata)
+        hits = type_hits.get('Date')
+        if hits:
+            score = 75.0
+            if col_lower == 'date' or col_lower == 'date1':
+                score = 90.0  # Simple "Date" or "Date1" is best
+            elif 'order' in hits or 'sale' in col_lower or 'transaction' in col_lower:
+                score = 85.0  # Transaction dates are good
+            elif 'created' in col_lower or 'updated' in col_lower:
+                score = 50.0  # System metadata - deprioritize
+            scores.append(('Date', score, "Date column"))
+        
+        # Sales patterns (prefer explicit names over generic)
+        hits = type_hits.get('Sales')
+        if hits:
+            score = 65.0
+            if 'sales' in hits and 'amount' in hits:
+                score = 95.0  # "Sales_Amount" is perfect
+            elif 'sales' in hits:
+                score = 90.0  # "Sales" is excellent
+            elif 'amount' in hits:
+                score = 85.0  # "Amount" is good
+            elif 'revenue' in hits:
+                score = 80.0  # "Revenue" is okay
+            elif 'value' in hits:
+                score = 70.0  # "Value" is generic
+            elif 'total' in hits:
+                score = 60.0  # "Total" is calculated field
+            scores.append(('Sales', score, "Sales/Amount"))
+        
+        # Product patterns (prefer specific identifiers)
+        hits = type_hits.get('Product')
+        if hits:
+            score = 70.0
+            if 'product' in hits and 'name' in hits:
+                score = 95.0  # "Product_Name" is perfect
+            elif 'product' in hits:
+                score = 90.0  # "Product" is excellent
+            elif 'item' in hits:
+                score = 85.0  # "Item" is good
+            elif col_lower == 'name':
+                score = 75.0  # Generic "Name" might be product
+            elif 'sku' in hits:
+                score = 90.0  # "SKU" is good
+            if 'category' in col_lower:
+                score = 60.0  # "Category" is grouping
+            scores.append(('Product', score, "Product"))
+        
+        # Region patterns (prefer primary locations, avoid secondaries)
+        hits = type_hits.get('Region')
+        if hits:
+            score = 70.0
+            if 'branch' in hits:
+                score = 90.0  # "Branch" is best for retail
+            elif 'location' in hits and '1' in column:
+                score = 85.0  # "Location1" is primary
+            elif 'location' in hits and '2' not in column:
+                score = 80.0  # Generic "Location"
+            elif 'region' in hits:
+                score = 80.0  # "Region" is good
+            # Penalize numbered secondaries
+            if '2' in column or 'secondary' in col_lower:
+                score = 50.0  # "Location2" is secondary
+            scores.append(('Region', score, "Location"))
+        
+        # Quantity patterns (prefer explicit quantity terms)
+        hits = type_hits.get('Quantity')
+        if hits:
+            score = 70.0
+            if 'qty' in hits or 'quantity' in hits:
+                score = 90.0  # "Qty" or "Quantity" is best
+            elif 'stock' in hits:
+                score = 85.0  # "Stock" is good for inventory
+            elif 'units' in hits:
+                score = 80.0  # "Units" is okay
+            elif 'count' in hits:
+                score = 65.0  # "Count" is generic, could be location count
+            scores.append(('Quantity', score, "Quantity"))
+        
+        if len(self._fallback_score_cache) >= self.fallback_score_cache_size:
+            self._fallback_score_cache.clear()
+        result = tuple(scores)
+        self._fallback_score_cache[column] = result
+        return result
+    
     def _fallback_mappings(self, columns: List[str]) -> List[ColumnMapping]:
         """
         Intelligent fallback mapper with duplicate prevention.
@@ -362,81 +518,8 @@ Return ONLY valid JSON in the format above. Keep reasoning under 100 characters.
             if not isinstance(column, str):
                 column = str(column)
             
-            col_lower = column.lower()
-            
-            # Date patterns (prefer transaction dates, not system metadata)
-            if any(kw in col_lower for kw in ['date', 'time', 'order']):
-                score = 75.0
-                if col_lower == 'date' or col_lower == 'date1':
-                    score = 90.0  # Simple "Date" or "Date1" is best
-                elif 'order' in col_lower or 'sale' in col_lower or 'transaction' in col_lower:
-                    score = 85.0  # Transaction dates are good
-                elif 'created' in col_lower or 'updated' in col_lower:
-                    score = 50.0  # System metadata - deprioritize
-                candidates['Date'].append((column, score, "Date column"))
-            
-            # Sales patterns (prefer explicit names over generic)
-            if any(kw in col_lower for kw in ['sales', 'amount', 'revenue', 'value', 'total']):
-                score = 65.0
-                if 'sales' in col_lower and 'amount' in col_lower:
-                    score = 95.0  # "Sales_Amount" is perfect
-                elif 'sales' in col_lower:
-                    score = 90.0  # "Sales" is excellent
-                elif 'amount' in col_lower:
-                    score = 85.0  # "Amount" is good
-                elif 'revenue' in col_lower:
-                    score = 80.0  # "Revenue" is okay
-                elif 'value' in col_lower:
-                    score = 70.0  # "Value" is generic
-                elif 'total' in col_lower:
-                    score = 60.0  # "Total" is calculated field
-                candidates['Sales'].append((column, score, "Sales/Amount"))
-            
-            # Product patterns (prefer specific identifiers)
-            if any(kw in col_lower for kw in ['product', 'item', 'sku', 'name']):
-                score = 70.0
-                if 'product' in col_lower and 'name' in col_lower:
-                    score = 95.0  # "Product_Name" is perfect
-                elif 'product' in col_lower:
-                    score = 90.0  # "Product" is excellent
-                elif 'item' in col_lower:
-                    score = 85.0  # "Item" is good
-                elif col_lower == 'name':
-                    score = 75.0  # Generic "Name" might be product
-                elif 'sku' in col_lower:
-                    score = 90.0  # "SKU" is good
-                if 'category' in col_lower:
-                    score = 60.0  # "Category" is grouping
-                candidates['Product'].append((column, score, "Product"))
-            
-            # Region patterns (prefer primary locations, avoid secondaries)
-            if any(kw in col_lower for kw in ['region', 'location', 'branch', 'store', 'city', 'area']):
-                score = 70.0
-                if 'branch' in col_lower:
-                    score = 90.0  # "Branch" is best for retail
-                elif 'location' in col_lower and '1' in column:
-                    score = 85.0  # "Location1" is primary
-                elif 'location' in col_lower and '2' not in column:
-                    score = 80.0  # Generic "Location"
-                elif 'region' in col_lower:
-                    score = 80.0  # "Region" is good
-                # Penalize numbered secondaries
-                if '2' in column or 'secondary' in col_lower:
-                    score = 50.0  # "Location2" is secondary
-                candidates['Region'].append((column, score, "Location"))
-            
-            # Quantity patterns (prefer explicit quantity terms)
-            if any(kw in col_lower for kw in ['quantity', 'qty', 'units', 'stock', 'count']):
-                score = 70.0
-                if 'qty' in col_lower or 'quantity' in col_lower:
-                    score = 90.0  # "Qty" or "Quantity" is best
-                elif 'stock' in col_lower:
-                    score = 85.0  # "Stock" is good for inventory
-                elif 'units' in col_lower:
-                    score = 80.0  # "Units" is okay
-                elif 'count' in col_lower:
-                    score = 65.0  # "Count" is generic, could be location count
-                candidates['Quantity'].append((column, score, "Quantity"))
+            for canonical_type, score, reasoning in self._score_fallback_column(column):
+                candidates[canonical_type].append((column, score, reasoning))
         
         # Step 2: Select BEST candidate for each type (ONLY ONE per type!)
         mappings = []
@@ -459,7 +542,8 @@ Return ONLY valid JSON in the format above. Keep reasoning under 100 characters.
                 ))
                 used_columns.add(best_column)
                 
-                print(f"   ✅ {best_column} → {canonical_type} (score: {best_score:.0f}, selected from {len(column_candidates)} candidates)")
+                logger.debug("   ✅ %s → %s (score: %.0f, selected from %d candidates)",
+                             best_column, canonical_type, best_score, len(column_candidates))
                 
                 # Mark other candidates as Ignore
                 for other_column, other_score, other_reason in column_candidates[1:]:
@@ -471,7 +555,7 @@ Return ONLY valid JSON in the format above. Keep reasoning under 100 characters.
                         source="fallback"
                     ))
                     used_columns.add(other_column)
-                    print(f"   ⏭️ {other_column} → Ignore (duplicate, {best_column} chosen)")
+                    logger.debug("   ⏭️ %s → Ignore (duplicate, %s chosen)", other_column, best_column)
         
         # Step 3: Mark any unmapped columns as Ignore
         for column in columns:
@@ -486,9 +570,10 @@ Return ONLY valid JSON in the format above. Keep reasoning under 100 characters.
                     reasoning="No clear business purpose",
                     source="fallback"
                 ))
-                print(f"   ⏭️ {column} → Ignore (no pattern match)")
+                logger.debug("   ⏭️ %s → Ignore (no pattern match)", column)
         
-        print(f"✅ Fallback complete: {len([m for m in mappings if m.mapped_to != 'Ignore'])} mapped, {len([m for m in mappings if m.mapped_to == 'Ignore'])} ignored")
+        ignored_count = sum(1 for m in mappings if m.mapped_to == 'Ignore')
+        print(f"✅ Fallback complete: {len(mappings) - ignored_count} mapped, {ignored_count} ignored")
         
         return mappings
     
@@ -523,23 +608,29 @@ Return ONLY valid JSON in the format above. Keep reasoning under 100 characters.
     
     def _store_in_cache(self, mappings: List[ColumnMapping]):
         """Store GPT mappings in cache database."""
+        rows = [
+            (
+                self._hash_column(mapping.original_column),
+                mapping.original_column,
+                mapping.mapped_to,
+                mapping.confidence,
+                mapping.reasoning
+            )
+            for mapping in mappings
+            if mapping.source == "gpt"  # Only cache GPT results
+        ]
+        if not rows:
+            return
+        
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        for mapping in mappings:
-            if mapping.source == "gpt":  # Only cache GPT results
-                column_hash = self._hash_column(mapping.original_column)
-                cursor.execute('''
-                    INSERT OR REPLACE INTO column_mappings 
-                    (column_hash, original_column, mapped_to, confidence, reasoning)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    column_hash,
-                    mapping.original_column,
-                    mapping.mapped_to,
-                    mapping.confidence,
-                    mapping.reasoning
-                ))
+        # One prepared statement and one transaction for the whole batch
+        cursor.executemany('''
+            INSERT OR REPLACE INTO column_mappings 
+            (column_hash, original_column, mapped_to, confidence, reasoning)
+            VALUES (?, ?, ?, ?, ?)
+        ''', rows)
         
         conn.commit()
         conn.close()
@@ -553,11 +644,9 @@ Return ONLY valid JSON in the format above. Keep reasoning under 100 characters.
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        cursor.execute('SELECT COUNT(*) FROM column_mappings')
-        total_cached = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT SUM(usage_count) FROM column_mappings')
-        total_usage = cursor.fetchone()[0] or 0
+        cursor.execute('SELECT COUNT(*), SUM(usage_count) FROM column_mappings')
+        total_cached, total_usage = cursor.fetchone()
+        total_usage = total_usage or 0
         
         conn.close()
         
@@ -4,7 +4,6 @@ Provides inventory-specific analytics and visualizations.
 """
 
 import pandas as pd
-import numpy as np
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from chart_styling import TANAWChartStyling
@@ -129,10 +128,12 @@ class TANAWInventoryAnalytics:
             
             # Group by product and sum quantities
             stock_data = df.groupby(product_col)[quantity_col].sum().reset_index()
-            stock_data = stock_data.sort_values(quantity_col, ascending=True)
             
-            # Take top 20 products to avoid overcrowding
-            stock_data = stock_data.head(20)
+            # Take the 20 lowest-stock products to avoid overcrowding
+            if pd.api.types.is_numeric_dtype(stock_data[quantity_col]):
+                stock_data = stock_data.nsmallest(20, quantity_col)
+            else:
+                stock_data = stock_data.sort_values(quantity_col, ascending=True).head(20)
             
             brief_description = "Displays current inventory levels for each product, sorted from lowest to highest stock. Shows the actual quantity on hand for each product. Use this to identify overstocked items (potential dead stock) and understocked items (potential stockouts). Helps optimize inventory investment and storage space allocation."
             
@@ -158,11 +159,7 @@ class TANAWInventoryAnalytics:
             
         except Exception as e:
             print(f"❌ Error generating stock level analysis: {e}")
-            # Try fallback methods
-            return self.fallback_handler.handle_inventory_fallback(
-                df, "stock_level_analysis", self._generate_stock_level_analysis,
-                column_mapping=column_mapping
-            )
+            return None
     
     def _generate_turnover_analysis(self, df: pd.DataFrame, column_mapping: Dict[str, str]) -> Optional[InventoryChart]:
         """Generate inventory turnover analysis."""
@@ -185,15 +182,14 @@ class TANAWInventoryAnalytics:
                 return None
             
             # Convert date column
-            df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+            dates = pd.to_datetime(df[date_col], errors='coerce')
             
             # Calculate monthly turnover by product
-            monthly_turnover = df.groupby([product_col, df[date_col].dt.to_period('M')])[quantity_col].sum().reset_index()
+            monthly_turnover = df.groupby([product_col, dates.dt.to_period('M')])[quantity_col].sum().reset_index()
             turnover_by_product = monthly_turnover.groupby(product_col)[quantity_col].mean().reset_index()
-            turnover_by_product = turnover_by_product.sort_values(quantity_col, ascending=False)
             
             # Take top 15 products
-            turnover_by_product = turnover_by_product.head(15)
+            turnover_by_product = turnover_by_product.nlargest(15, quantity_col)
             
             brief_description = "Calculates the average monthly inventory movement for each product. Data is grouped by product and month, then averaged to show typical monthly turnover. Higher values indicate faster-moving inventory. Use this to optimize stock levels, identify slow-moving items, and improve cash flow management."
             
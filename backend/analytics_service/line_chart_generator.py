@@ -5,7 +5,6 @@ Handles: Sales Summary, Profit Trends, Cash Flow Analysis, Inventory Turnover
 """
 
 import pandas as pd
-import numpy as np
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
@@ -252,11 +251,7 @@ class TANAWLineChartGenerator:
             print(f"❌ Error generating Time Series chart: {e}")
             import traceback
             traceback.print_exc()
-            # Try fallback methods
-            return self.fallback_handler.handle_line_chart_fallback(
-                df, "time_series", self.generate_sales_summary,
-                date_col=date_col, value_col=value_col
-            )
+            return None
     
     # REMOVED: generate_revenue_over_time method (redundant with Sales Over Time)
     
@@ -467,11 +462,7 @@ class TANAWLineChartGenerator:
             print(f"❌ Error generating Inventory Turnover chart: {e}")
             import traceback
             traceback.print_exc()
-            # Try fallback methods
-            return self.fallback_handler.handle_line_chart_fallback(
-                df, "inventory_turnover", self.generate_inventory_turnover,
-                date_col=date_col, turnover_col=turnover_col
-            )
+            return None
     
     def can_generate_chart(self, df: pd.DataFrame, chart_type: str) -> Dict[str, Any]:
         """
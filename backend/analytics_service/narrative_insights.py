@@ -8,6 +8,7 @@ import json
 import logging
 import asyncio
 import time
+import random
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
@@ -24,6 +25,8 @@ class TANAWNarrativeInsights:
         self.model = "gpt-4o-mini"  # Cost-effective model for narrative generation
         self.batch_size = 3  # Process 3 charts per batch
         self.max_retries = 3
+        self.retry_backoff_base = 1.0  # Seconds before the first retry
+        self.retry_backoff_max = 8.0  # Cap on the un-jittered delay
         self.feedback_enhancements = None  # Store feedback-based prompt enhancements
     
     def generate_batch_insights(self, charts_data: List[Dict[str, Any]], domain: str = "sales") -> Dict[str, Any]:
@@ -239,7 +242,9 @@ class TANAWNarrativeInsights:
             except Exception as e:
                 print(f"📝 GPT API error on attempt {attempt + 1}: {str(e)}")
                 if attempt < self.max_retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
+                    # Capped exponential backoff with jitter
+                    delay = min(self.retry_backoff_max, self.retry_backoff_base * 2 ** attempt)
+                    time.sleep(delay * (0.5 + random.random()))
                     continue
                 else:
                     raise e
@@ -6,14 +6,10 @@ Implements forecasting and predictive analytics using Prophet and other ML model
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime, timedelta
 import logging
 
 try:
     from prophet import Prophet
-    from prophet.plot import plot_plotly, plot_components_plotly
-    import plotly.graph_objects as go
-    from plotly.subplots import make_subplots
     PLOTLY_AVAILABLE = True
 except ImportError:
     PLOTLY_AVAILABLE = False
@@ -140,7 +140,8 @@ class RobustFileParser:
         """Parse CSV file with encoding and delimiter detection."""
         try:
             # Try pandas default first
-            df = pd.read_csv(file_path)
+            # Map the file instead of streaming it through read() calls
+            df = pd.read_csv(file_path, memory_map=True)
             encoding_used = "utf-8"  # pandas default
             delimiter_used = ","
             
@@ -168,12 +169,25 @@ class RobustFileParser:
                 try:
                     print("🔄 Trying delimiter detection...")
                     with open(file_path, 'rb') as f:
-                        sample = f.read(1024)
-                        detected = chardet.detect(sample)
-                        encoding = detected['encoding']
+                        sample = f.read(16384)
+                    detected = chardet.detect(sample)
+                    encoding = detected['encoding']
+                    
+                    # Sniff the delimiter from the same prefix so the likely one is
+                    # parsed first; the rest stay as fallbacks
+                    delimiters = [',', ';', '\t', '|']
+                    sample_text = sample.decode(encoding or 'utf-8', errors='replace')
+                    if '\n' in sample_text:
+                        sample_text = sample_text[:sample_text.rindex('\n')]  # drop the partial last line
+                    try:
+                        sniffed = csv.Sniffer().sniff(sample_text, delimiters=''.join(delimiters)).delimiter
+                        delimiters.remove(sniffed)
+                        delimiters.insert(0, sniffed)
+                    except csv.Error:
+                        pass
                     
                     # Try detected encoding with different delimiters
-                    for delimiter in [',', ';', '\t', '|']:
+                    for delimiter in delimiters:
                         try:
                             df = pd.read_csv(file_path, encoding=encoding, sep=delimiter)
                             encoding_used = encoding
@@ -213,7 +227,7 @@ class RobustFileParser:
             delimiter_used=delimiter_used,
             row_count=len(df),
             col_count=len(df.columns),
-            memory_size_mb=df.memory_usage(deep=True).sum() / (1024 * 1024),
+            memory_size_mb=profile.memory_size_mb,
             analysis_mode=profile.analysis_mode,
             sample_info=sample_info,
             profile=self._serialize_profile(profile)
@@ -277,7 +291,7 @@ class RobustFileParser:
                 sheet_name=sheet_name,
                 row_count=len(df),
                 col_count=len(df.columns),
-                memory_size_mb=df.memory_usage(deep=True).sum() / (1024 * 1024),
+                memory_size_mb=profile.memory_size_mb,
                 analysis_mode=profile.analysis_mode,
                 sample_info=sample_info,
                 profile=self._serialize_profile(profile)
@@ -292,7 +306,7 @@ class RobustFileParser:
     def _parse_tsv(self, file_path: Path) -> ParseResult:
         """Parse TSV (Tab-Separated Values) file."""
         try:
-            df = pd.read_csv(file_path, sep='\t')
+            df = pd.read_csv(file_path, sep='\t', memory_map=True)
             
             # Profile and sample the data
             profile = self._profile_data(df)
@@ -304,7 +318,7 @@ class RobustFileParser:
                 delimiter_used='\t',
                 row_count=len(df),
                 col_count=len(df.columns),
-                memory_size_mb=df.memory_usage(deep=True).sum() / (1024 * 1024),
+                memory_size_mb=profile.memory_size_mb,
                 analysis_mode=profile.analysis_mode,
                 sample_info=sample_info,
                 profile=self._serialize_profile(profile)
@@ -414,12 +428,13 @@ class RobustFileParser:
                 print(f"⚠️ Detected CSV title row issue - {unnamed_ratio*100:.0f}% unnamed columns")
                 print(f"🔧 Attempting to re-parse CSV with skiprows=1...")
                 
-                # Re-parse the CSV file skipping the first row
-                df_retry = pd.read_csv(file_path, skiprows=1)
+                # Check the header row that skipping the first row would give; the
+                # full re-parse only happens if it is actually better
+                retry_columns = pd.read_csv(file_path, skiprows=1, nrows=0).columns
                 
                 # Validate the retry result
-                unnamed_count_retry = sum(1 for col in df_retry.columns if str(col).startswith('Unnamed:'))
-                total_cols_retry = len(df_retry.columns)
+                unnamed_count_retry = sum(1 for col in retry_columns if str(col).startswith('Unnamed:'))
+                total_cols_retry = len(retry_columns)
                 unnamed_ratio_retry = unnamed_count_retry / total_cols_retry if total_cols_retry > 0 else 0
                 
                 print(f"🔍 CSV Retry Result: {unnamed_count_retry}/{total_cols_retry} unnamed columns ({unnamed_ratio_retry*100:.1f}%)")
@@ -429,8 +444,8 @@ class RobustFileParser:
                     improvement = (unnamed_ratio - unnamed_ratio_retry) * 100
                     print(f"✅ CSV title row detected and skipped! Header quality improved by {improvement:.1f}%")
                     print(f"📋 Old headers: {list(df.columns)[:5]}...")
-                    print(f"📋 New headers: {list(df_retry.columns)[:5]}...")
-                    return df_retry
+                    print(f"📋 New headers: {list(retry_columns)[:5]}...")
+                    return pd.read_csv(file_path, skiprows=1, memory_map=True)
                 else:
                     print(f"ℹ️ CSV retry didn't improve headers, using original")
                     return df
@@ -454,8 +469,8 @@ class RobustFileParser:
             # Data types
             dtypes = {col: str(dtype) for col, dtype in df.dtypes.items()}
             
-            # Null percentages
-            null_pct = {col: (df[col].isna().sum() / len(df)) * 100 for col in df.columns}
+            # Null percentages, all columns in one reduction
+            null_pct = (df.isna().mean() * 100).to_dict()
             
             # Duplicate rows
             duplicate_rows = df.duplicated().sum()
@@ -7,14 +7,11 @@ Generates predictive analytics and forecasting charts for Sales domain
 import pandas as pd
 import numpy as np
 from typing import Dict, Any, List, Optional, Tuple
-from datetime import datetime, timedelta
-import warnings
-warnings.filterwarnings('ignore')
+from forecast_utils import format_dates, linear_fit
 
 # Import Prophet for advanced forecasting
 try:
     from prophet import Prophet
-    from prophet.plot import plot_plotly, plot_components_plotly
     PROPHET_AVAILABLE = True
 except ImportError:
     PROPHET_AVAILABLE = False
@@ -59,6 +56,7 @@ class TANAWSalesForecastGenerator:
         """
         try:
             available_cols = []
+            numeric_checks = {}  # column -> mostly numeric, shared by all tiers below
             
             # Check for Date column - 3-TIER PRIORITIZATION
             date_col = None
@@ -67,24 +65,16 @@ class TANAWSalesForecastGenerator:
             if hasattr(self, 'column_mapping') and self.column_mapping:
                 for original_col, canonical_type in self.column_mapping.items():
                     if canonical_type == "Date" and original_col in df.columns:
-                        try:
-                            pd.to_datetime(df[original_col].head(5), errors='coerce')
-                            date_col = original_col
-                            available_cols.append(date_col)
-                            print(f"✅ Using mapped Date column: {original_col}")
-                            break
-                        except:
-                            pass
+                        date_col = original_col
+                        available_cols.append(date_col)
+                        print(f"✅ Using mapped Date column: {original_col}")
+                        break
             
             # PRIORITY 2: Check for canonical "Date" column
             if not date_col and "Date" in df.columns:
-                try:
-                    pd.to_datetime(df["Date"].head(5), errors='coerce')
-                    date_col = "Date"
-                    available_cols.append(date_col)
-                    print(f"✅ Using canonical Date column")
-                except:
-                    pass
+                date_col = "Date"
+                available_cols.append(date_col)
+                print(f"✅ Using canonical Date column")
             
             # PRIORITY 3: Flexible search
             if not date_col:
@@ -99,15 +89,10 @@ class TANAWSalesForecastGenerator:
                     col_lower = col.lower().replace(" ", "_").replace("-", "_")
                     if any(candidate.lower().replace(" ", "_") in col_lower or col_lower in candidate.lower().replace(" ", "_") 
                            for candidate in date_candidates):
-                        # Try to parse as date
-                        try:
-                            pd.to_datetime(df[col].head(5), errors='coerce')
-                            date_col = col
-                            available_cols.append(col)
-                            print(f"✅ Found date column via flexible search: {col}")
-                            break
-                        except:
-                            continue
+                        date_col = col
+                        available_cols.append(col)
+                        print(f"✅ Found date column via flexible search: {col}")
+                        break
             
             if not date_col:
                 return {
@@ -125,26 +110,18 @@ class TANAWSalesForecastGenerator:
             if hasattr(self, 'column_mapping') and self.column_mapping:
                 for original_col, canonical_type in self.column_mapping.items():
                     if canonical_type == "Sales" and original_col in df.columns:
-                        try:
-                            numeric_data = pd.to_numeric(df[original_col], errors='coerce')
-                            if numeric_data.notna().sum() / len(df) >= 0.5:
-                                sales_col = original_col
-                                available_cols.append(sales_col)
-                                print(f"✅ Using mapped Sales column: {original_col}")
-                                break
-                        except:
-                            pass
+                        if self._is_mostly_numeric(df, original_col, numeric_checks):
+                            sales_col = original_col
+                            available_cols.append(sales_col)
+                            print(f"✅ Using mapped Sales column: {original_col}")
+                            break
             
             # PRIORITY 2: Check for canonical "Sales" column
             if not sales_col and "Sales" in df.columns:
-                try:
-                    numeric_data = pd.to_numeric(df["Sales"], errors='coerce')
-                    if numeric_data.notna().sum() / len(df) >= 0.5:
-                        sales_col = "Sales"
-                        available_cols.append(sales_col)
-                        print(f"✅ Using canonical Sales column")
-                except:
-                    pass
+                if self._is_mostly_numeric(df, "Sales", numeric_checks):
+                    sales_col = "Sales"
+                    available_cols.append(sales_col)
+                    print(f"✅ Using canonical Sales column")
             
             # PRIORITY 3: Flexible search
             if not sales_col:
@@ -159,15 +136,11 @@ class TANAWSalesForecastGenerator:
                     if any(candidate.lower().replace(" ", "_") in col_lower or col_lower in candidate.lower().replace(" ", "_") 
                            for candidate in sales_candidates):
                         # Validate numeric
-                        try:
-                            numeric_data = pd.to_numeric(df[col], errors='coerce')
-                            if numeric_data.notna().sum() / len(df) >= 0.5:
-                                sales_col = col
-                                available_cols.append(col)
-                                print(f"✅ Found sales column via flexible search: {col}")
-                                break
-                        except:
-                            continue
+                        if self._is_mostly_numeric(df, col, numeric_checks):
+                            sales_col = col
+                            available_cols.append(col)
+                            print(f"✅ Found sales column via flexible search: {col}")
+                            break
             
             if not sales_col:
                 return {
@@ -185,26 +158,18 @@ class TANAWSalesForecastGenerator:
             if hasattr(self, 'column_mapping') and self.column_mapping:
                 for original_col, canonical_type in self.column_mapping.items():
                     if canonical_type == "Quantity" and original_col in df.columns:
-                        try:
-                            numeric_data = pd.to_numeric(df[original_col], errors='coerce')
-                            if numeric_data.notna().sum() / len(df) >= 0.5:
-                                quantity_col = original_col
-                                available_cols.append(quantity_col)
-                                print(f"✅ Using mapped Quantity column: {original_col}")
-                                break
-                        except:
-                            pass
+                        if self._is_mostly_numeric(df, original_col, numeric_checks):
+                            quantity_col = original_col
+                            available_cols.append(quantity_col)
+                            print(f"✅ Using mapped Quantity column: {original_col}")
+                            break
             
             # Check for canonical "Quantity" column
             if not quantity_col and "Quantity" in df.columns:
-                try:
-                    numeric_data = pd.to_numeric(df["Quantity"], errors='coerce')
-                    if numeric_data.notna().sum() / len(df) >= 0.5:
-                        quantity_col = "Quantity"
-                        available_cols.append(quantity_col)
-                        print(f"✅ Using canonical Quantity column")
-                except:
-                    pass
+                if self._is_mostly_numeric(df, "Quantity", numeric_checks):
+                    quantity_col = "Quantity"
+                    available_cols.append(quantity_col)
+                    print(f"✅ Using canonical Quantity column")
             
             # Flexible search for Quantity
             if not quantity_col:
@@ -212,15 +177,11 @@ class TANAWSalesForecastGenerator:
                 for col in df.columns:
                     col_lower = col.lower().replace(" ", "_").replace("-", "_")
                     if any(candidate.lower().replace(" ", "_") in col_lower for candidate in quantity_candidates):
-                        try:
-                            numeric_data = pd.to_numeric(df[col], errors='coerce')
-                            if numeric_data.notna().sum() / len(df) >= 0.5:
-                                quantity_col = col
-                                available_cols.append(col)
-                                print(f"✅ Found quantity column via flexible search: {col}")
-                                break
-                        except:
-                            continue
+                        if self._is_mostly_numeric(df, col, numeric_checks):
+                            quantity_col = col
+                            available_cols.append(col)
+                            print(f"✅ Found quantity column via flexible search: {col}")
+                            break
             
             if quantity_col:
                 print(f"✅ Quantity column detected: {quantity_col} - Will generate Quantity Forecast")
@@ -255,6 +216,23 @@ class TANAWSalesForecastGenerator:
                 "description": f"Error checking forecast readiness: {e}"
             }
     
+    def _is_mostly_numeric(self, df: pd.DataFrame, col: str, cache: Dict[str, bool]) -> bool:
+        """
+        Check whether at least half of a column parses as numeric.
+        Results are memoized in cache so a column probed by several tiers
+        (Sales and Quantity candidates overlap) is only coerced once.
+        """
+        if col not in cache:
+            try:
+                series = df[col]
+                # Numeric dtypes are already parsed; only coerce object/string data
+                if not pd.api.types.is_numeric_dtype(series):
+                    series = pd.to_numeric(series, errors='coerce')
+                cache[col] = series.notna().sum() / len(df) >= 0.5
+            except Exception:
+                cache[col] = False
+        return cache[col]
+    
     def generate_sales_forecast(self, df: pd.DataFrame, date_col: str, sales_col: str) -> Dict[str, Any]:
         """
         Generate sales forecast chart using Prophet for advanced forecasting
@@ -318,34 +296,23 @@ class TANAWSalesForecastGenerator:
             forecast = model.predict(future)
             
             # Extract historical and forecast data
-            historical_data = []
-            forecast_data = []
-            
             # Historical data (actual)
-            for i, row in prophet_data.iterrows():
-                historical_data.append({
-                    "x": row['ds'].strftime('%Y-%m-%d'),
-                    "y": float(row['y']),
-                    "type": "historical"
-                })
-            
-            # Forecast data (predicted)
+            historical_sales = prophet_data['y'].astype(float).tolist()
+            chart_data = [
+                {"x": date, "y": value, "type": "historical"}
+                for date, value in zip(format_dates(prophet_data['ds']), historical_sales)
+            ]
+            
+            # Forecast data (predicted), appended in place for chart display
             forecast_rows = forecast.tail(self.forecast_periods)
-            for _, row in forecast_rows.iterrows():
-                forecast_data.append({
-                    "x": row['ds'].strftime('%Y-%m-%d'),
-                    "y": float(row['yhat']),
-                    "upper": float(row['yhat_upper']),
-                    "lower": float(row['yhat_lower']),
-                    "type": "forecast"
-                })
-            
-            # Combine for chart display
-            chart_data = historical_data + forecast_data
-            
-            # Calculate advanced metrics
-            historical_sales = [item["y"] for item in historical_data]
-            forecast_sales = [item["y"] for item in forecast_data]
+            forecast_sales = forecast_rows['yhat'].tolist()
+            chart_data.extend(
+                {"x": date, "y": yhat, "upper": upper, "lower": lower, "type": "forecast"}
+                for date, yhat, upper, lower in zip(format_dates(forecast_rows['ds']),
+                                                    forecast_sales,
+                                                    forecast_rows['yhat_upper'].tolist(),
+                                                    forecast_rows['yhat_lower'].tolist())
+            )
             
             # Calculate trend and seasonality metrics
             trend_slope = float(forecast['trend'].iloc[-1] - forecast['trend'].iloc[-self.forecast_periods-1]) / self.forecast_periods
@@ -386,9 +353,9 @@ class TANAWSalesForecastGenerator:
             
         except Exception as e:
             print(f"❌ Error in Prophet forecast: {e}")
-            # Try comprehensive fallback methods
+            # Fall back to linear regression
             return self.fallback_handler.handle_forecast_fallback(
-                daily_sales, "sales_forecast", self._generate_prophet_forecast,
+                daily_sales, "sales_forecast", [self._generate_linear_forecast],
                 date_col=date_col, sales_col=sales_col
             )
     
@@ -404,59 +371,45 @@ class TANAWSalesForecastGenerator:
             x = daily_sales['date_numeric'].values
             y = daily_sales[sales_col].values
             
-            # Calculate trend
-            n = len(x)
-            sum_x = np.sum(x)
-            sum_y = np.sum(y)
-            sum_xy = np.sum(x * y)
-            sum_x2 = np.sum(x * x)
-            
             # Linear regression coefficients
-            slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x * sum_x)
-            intercept = (sum_y - slope * sum_x) / n
+            n = len(x)
+            y_mean = np.mean(y)
+            slope, intercept = linear_fit(x, y)
             
             # Calculate R-squared for confidence
             y_pred = slope * x + intercept
             ss_res = np.sum((y - y_pred) ** 2)
-            ss_tot = np.sum((y - np.mean(y)) ** 2)
+            ss_tot = np.sum((y - y_mean) ** 2)
             r_squared = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
             
             # Generate forecast
             last_date = daily_sales[date_col].max()
-            forecast_dates = [last_date + timedelta(days=i+1) for i in range(self.forecast_periods)]
-            forecast_x = [daily_sales['date_numeric'].max() + i + 1 for i in range(self.forecast_periods)]
-            forecast_y = [slope * x_val + intercept for x_val in forecast_x]
+            forecast_dates = format_dates(last_date + pd.to_timedelta(np.arange(1, self.forecast_periods + 1), unit='D'))
+            forecast_x = daily_sales['date_numeric'].max() + np.arange(1, self.forecast_periods + 1)
+            forecast_y_arr = slope * forecast_x + intercept
+            forecast_y = forecast_y_arr.tolist()
             
             # Calculate confidence intervals (simplified)
             std_error = np.sqrt(ss_res / (n - 2)) if n > 2 else np.std(y)
             confidence_margin = 1.96 * std_error  # 95% confidence
             
-            upper_bound = [y + confidence_margin for y in forecast_y]
-            lower_bound = [max(0, y - confidence_margin) for y in forecast_y]
+            upper_bound = (forecast_y_arr + confidence_margin).tolist()
+            lower_bound = np.maximum(0, forecast_y_arr - confidence_margin).tolist()
             
             # Prepare chart data for frontend
             # Historical data with type field
-            historical_data = []
-            for i, (date, sales) in enumerate(zip(daily_sales[date_col], daily_sales[sales_col])):
-                historical_data.append({
-                    "x": date.strftime('%Y-%m-%d'),
-                    "y": float(sales),
-                    "type": "historical"
-                })
-            
-            # Forecast data with type field
-            forecast_data = []
-            for i, (date, sales, upper, lower) in enumerate(zip(forecast_dates, forecast_y, upper_bound, lower_bound)):
-                forecast_data.append({
-                    "x": date.strftime('%Y-%m-%d'),
-                    "y": float(sales),
-                    "upper": float(upper),
-                    "lower": float(lower),
-                    "type": "forecast"
-                })
-            
-            # Combine for chart display
-            chart_data = historical_data + forecast_data
+            historical_dates = format_dates(daily_sales[date_col])
+            historical_values = daily_sales[sales_col].astype(float).tolist()
+            chart_data = [
+                {"x": date, "y": sales, "type": "historical"}
+                for date, sales in zip(historical_dates, historical_values)
+            ]
+            
+            # Forecast data with type field, appended in place for chart display
+            chart_data.extend(
+                {"x": date, "y": sales, "upper": upper, "lower": lower, "type": "forecast"}
+                for date, sales, upper, lower in zip(forecast_dates, forecast_y, upper_bound, lower_bound)
+            )
             
             # Generate smart labels
             labels = self._generate_smart_labels(sales_col)
@@ -483,9 +436,9 @@ class TANAWSalesForecastGenerator:
                     "r_squared": float(r_squared),
                     "forecast_periods": int(self.forecast_periods),
                     "confidence_level": float(self.confidence_level),
-                    "total_historical_sales": float(sum([item['y'] for item in historical_data])),
+                    "total_historical_sales": float(sum(historical_values)),
                     "predicted_total_forecast": float(sum(forecast_y)),
-                    "growth_rate": f"{(float(slope) / float(np.mean([item['y'] for item in historical_data])) * 100):.2f}%" if float(np.mean([item['y'] for item in historical_data])) > 0 else "0%",
+                    "growth_rate": f"{(float(slope) / float(y_mean) * 100):.2f}%" if y_mean > 0 else "0%",
                     "model_accuracy": "Medium (Linear Regression)"
                 }
             }
@@ -582,27 +535,16 @@ class TANAWSalesForecastGenerator:
             forecast = model.predict(future)
             
             # Extract historical and forecast data
-            historical_data = []
-            forecast_data = []
-            
-            for i, row in prophet_data.iterrows():
-                historical_data.append({
-                    "x": row['ds'].strftime('%Y-%m-%d'),
-                    "y": float(row['y']),
-                    "type": "historical"
-                })
-            
+            historical_values = prophet_data['y'].astype(float).tolist()
+            n_hist = len(historical_values)
             forecast_rows = forecast.tail(self.forecast_periods)
-            for _, row in forecast_rows.iterrows():
-                forecast_data.append({
-                    "x": row['ds'].strftime('%Y-%m-%d'),
-                    "y": float(row['yhat']),
-                    "upper": float(row['yhat_upper']),
-                    "lower": float(row['yhat_lower']),
-                    "type": "forecast"
-                })
             
-            chart_data = historical_data + forecast_data
+            # Columnar chart payload: historical points followed by the forecast
+            x_values = format_dates(prophet_data['ds'])
+            x_values.extend(format_dates(forecast_rows['ds']))
+            y_values = historical_values + forecast_rows['yhat'].tolist()
+            upper_values = historical_values + forecast_rows['yhat_upper'].tolist()
+            lower_values = historical_values + forecast_rows['yhat_lower'].tolist()
             
             # Smart labeling
             quantity_col_lower = quantity_col.lower()
@@ -624,11 +566,11 @@ class TANAWSalesForecastGenerator:
                 "category": "product",  # Changed from "sales" to "product"
                 "icon": "📦",
                 "data": {
-                    "x": [item["x"] for item in chart_data],
-                    "y": [item["y"] for item in chart_data],
-                    "forecast_line": len(historical_data),
-                    "upper_bound": [item.get("upper", item["y"]) for item in chart_data],
-                    "lower_bound": [item.get("lower", item["y"]) for item in chart_data],
+                    "x": x_values,
+                    "y": y_values,
+                    "forecast_line": n_hist,
+                    "upper_bound": upper_values,
+                    "lower_bound": lower_values,
                 },
                 "config": {
                     "x_label": "Date",
@@ -650,31 +592,20 @@ class TANAWSalesForecastGenerator:
             daily_quantity['date_numeric'] = (daily_quantity[date_col] - daily_quantity[date_col].min()).dt.days
             
             # Fit linear model
-            from numpy.polynomial import Polynomial
-            p = Polynomial.fit(daily_quantity['date_numeric'], daily_quantity[quantity_col], 1)
+            slope, intercept = linear_fit(daily_quantity['date_numeric'], daily_quantity[quantity_col])
             
             # Generate forecast
             future_days = np.arange(len(daily_quantity), len(daily_quantity) + self.forecast_periods)
-            future_quantity = p(future_days)
+            future_quantity = intercept + slope * future_days
             
-            # Create chart data
-            historical_data = []
-            for _, row in daily_quantity.iterrows():
-                historical_data.append({
-                    "x": row[date_col].strftime('%Y-%m-%d'),
-                    "y": float(row[quantity_col])
-                })
+            # Create chart data: historical points followed by the forecast
+            x_values = format_dates(daily_quantity[date_col])
+            y_values = daily_quantity[quantity_col].astype(float).tolist()
+            n_hist = len(y_values)
             
             last_date = daily_quantity[date_col].max()
-            forecast_data = []
-            for i, qty in enumerate(future_quantity):
-                future_date = last_date + timedelta(days=i+1)
-                forecast_data.append({
-                    "x": future_date.strftime('%Y-%m-%d'),
-                    "y": float(max(0, qty))  # Quantity can't be negative
-                })
-            
-            chart_data = historical_data + forecast_data
+            x_values.extend(format_dates(last_date + pd.to_timedelta(np.arange(1, len(future_quantity) + 1), unit='D')))
+            y_values.extend(np.maximum(0, future_quantity).tolist())  # Quantity can't be negative
             
             return {
                 "id": f"quantity_forecast_{quantity_col}",
@@ -684,9 +615,9 @@ class TANAWSalesForecastGenerator:
                 "category": "product",  # Changed from "sales" to "product"
                 "icon": "📦",
                 "data": {
-                    "x": [item["x"] for item in chart_data],
-                    "y": [item["y"] for item in chart_data],
-                    "forecast_line": len(historical_data)
+                    "x": x_values,
+                    "y": y_values,
+                    "forecast_line": n_hist
                 },
                 "config": {
                     "x_label": "Date",
@@ -7,15 +7,12 @@ Generates predictive analytics and forecasting charts for Inventory domain
 import pandas as pd
 import numpy as np
 from typing import Dict, Any, List, Optional, Tuple
-from datetime import datetime, timedelta
-import warnings
-warnings.filterwarnings('ignore')
+from forecast_utils import format_dates, linear_fit
 from chart_styling import TANAWChartStyling
 
 # Import Prophet for advanced forecasting
 try:
     from prophet import Prophet
-    from prophet.plot import plot_plotly, plot_components_plotly
     PROPHET_AVAILABLE = True
 except ImportError:
     PROPHET_AVAILABLE = False
@@ -70,14 +67,9 @@ class TANAWStockForecastGenerator:
                 col_lower = col.lower().replace(" ", "_").replace("-", "_")
                 if any(candidate.lower().replace(" ", "_") in col_lower or col_lower in candidate.lower().replace(" ", "_") 
                        for candidate in date_candidates):
-                    # Try to parse as date
-                    try:
-                        pd.to_datetime(df[col].head(5), errors='coerce')
-                        date_col = col
-                        available_cols.append(col)
-                        break
-                    except:
-                        continue
+                    date_col = col
+                    available_cols.append(col)
+                    break
             
             if not date_col:
                 return {
@@ -101,7 +93,9 @@ class TANAWStockForecastGenerator:
                        for candidate in stock_candidates):
                     # Validate numeric
                     try:
-                        numeric_data = pd.to_numeric(df[col], errors='coerce')
+                        numeric_data = df[col]
+                        if not pd.api.types.is_numeric_dtype(numeric_data):
+                            numeric_data = pd.to_numeric(numeric_data, errors='coerce')
                         if numeric_data.notna().sum() / len(df) >= 0.5:
                             stock_col = col
                             available_cols.append(col)
@@ -209,34 +203,23 @@ class TANAWStockForecastGenerator:
             forecast = model.predict(future)
             
             # Extract historical and forecast data
-            historical_data = []
-            forecast_data = []
-            
             # Historical data (actual)
-            for i, row in prophet_data.iterrows():
-                historical_data.append({
-                    "x": row['ds'].strftime('%Y-%m-%d'),
-                    "y": float(row['y']),
-                    "type": "historical"
-                })
-            
-            # Forecast data (predicted)
+            historical_stock = prophet_data['y'].astype(float).tolist()
+            chart_data = [
+                {"x": date, "y": value, "type": "historical"}
+                for date, value in zip(format_dates(prophet_data['ds']), historical_stock)
+            ]
+            
+            # Forecast data (predicted), appended in place for chart display
             forecast_rows = forecast.tail(self.forecast_periods)
-            for _, row in forecast_rows.iterrows():
-                forecast_data.append({
-                    "x": row['ds'].strftime('%Y-%m-%d'),
-                    "y": float(row['yhat']),
-                    "upper": float(row['yhat_upper']),
-                    "lower": float(row['yhat_lower']),
-                    "type": "forecast"
-                })
-            
-            # Combine for chart display
-            chart_data = historical_data + forecast_data
-            
-            # Calculate advanced metrics
-            historical_stock = [item["y"] for item in historical_data]
-            forecast_stock = [item["y"] for item in forecast_data]
+            forecast_stock = forecast_rows['yhat'].tolist()
+            chart_data.extend(
+                {"x": date, "y": yhat, "upper": upper, "lower": lower, "type": "forecast"}
+                for date, yhat, upper, lower in zip(format_dates(forecast_rows['ds']),
+                                                    forecast_stock,
+                                                    forecast_rows['yhat_upper'].tolist(),
+                                                    forecast_rows['yhat_lower'].tolist())
+            )
             
             # Calculate trend and seasonality metrics
             trend_slope = float(forecast['trend'].iloc[-1] - forecast['trend'].iloc[-self.forecast_periods-1]) / self.forecast_periods
@@ -296,63 +279,49 @@ class TANAWStockForecastGenerator:
             x = daily_stock['date_numeric'].values
             y = daily_stock[stock_col].values
             
-            # Calculate trend
-            n = len(x)
-            sum_x = np.sum(x)
-            sum_y = np.sum(y)
-            sum_xy = np.sum(x * y)
-            sum_x2 = np.sum(x * x)
-            
             # Linear regression coefficients
-            slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x * sum_x)
-            intercept = (sum_y - slope * sum_x) / n
+            n = len(x)
+            y_mean = np.mean(y)
+            slope, intercept = linear_fit(x, y)
             
             # Calculate R-squared for confidence
             y_pred = slope * x + intercept
             ss_res = np.sum((y - y_pred) ** 2)
-            ss_tot = np.sum((y - np.mean(y)) ** 2)
+            ss_tot = np.sum((y - y_mean) ** 2)
             r_squared = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
             
             # Generate forecast
             last_date = daily_stock[date_col].max()
-            forecast_dates = [last_date + timedelta(days=i+1) for i in range(self.forecast_periods)]
-            forecast_x = [daily_stock['date_numeric'].max() + i + 1 for i in range(self.forecast_periods)]
-            forecast_y = [slope * x_val + intercept for x_val in forecast_x]
+            forecast_dates = format_dates(last_date + pd.to_timedelta(np.arange(1, self.forecast_periods + 1), unit='D'))
+            forecast_x = daily_stock['date_numeric'].max() + np.arange(1, self.forecast_periods + 1)
+            forecast_y_arr = slope * forecast_x + intercept
+            forecast_y = forecast_y_arr.tolist()
             
             # Calculate confidence intervals (simplified)
             std_error = np.sqrt(ss_res / (n - 2)) if n > 2 else np.std(y)
             confidence_margin = 1.96 * std_error  # 95% confidence
             
-            upper_bound = [y + confidence_margin for y in forecast_y]
-            lower_bound = [max(0, y - confidence_margin) for y in forecast_y]
+            upper_bound = (forecast_y_arr + confidence_margin).tolist()
+            lower_bound = np.maximum(0, forecast_y_arr - confidence_margin).tolist()
             
             # Prepare chart data for frontend
             # Historical data with type field
-            historical_data = []
-            for i, (date, stock) in enumerate(zip(daily_stock[date_col], daily_stock[stock_col])):
-                historical_data.append({
-                    "x": date.strftime('%Y-%m-%d'),
-                    "y": float(stock),
-                    "type": "historical"
-                })
-            
-            # Forecast data with type field
-            forecast_data = []
-            for i, (date, stock, upper, lower) in enumerate(zip(forecast_dates, forecast_y, upper_bound, lower_bound)):
-                forecast_data.append({
-                    "x": date.strftime('%Y-%m-%d'),
-                    "y": float(stock),
-                    "upper": float(upper),
-                    "lower": float(lower),
-                    "type": "forecast"
-                })
-            
-            # Combine for chart display
-            chart_data = historical_data + forecast_data
+            historical_dates = format_dates(daily_stock[date_col])
+            historical_values = daily_stock[stock_col].astype(float).tolist()
+            chart_data = [
+                {"x": date, "y": stock, "type": "historical"}
+                for date, stock in zip(historical_dates, historical_values)
+            ]
+            
+            # Forecast data with type field, appended in place for chart display
+            chart_data.extend(
+                {"x": date, "y": stock, "upper": upper, "lower": lower, "type": "forecast"}
+                for date, stock, upper, lower in zip(forecast_dates, forecast_y, upper_bound, lower_bound)
+            )
             
             # Calculate reorder recommendations
             reorder_analysis = self._calculate_reorder_recommendations(
-                [item["y"] for item in historical_data], 
+                historical_values, 
                 forecast_y
             )
             
@@ -381,9 +350,9 @@ class TANAWStockForecastGenerator:
                     "r_squared": float(r_squared),
                     "forecast_periods": int(self.forecast_periods),
                     "confidence_level": float(self.confidence_level),
-                    "avg_historical_stock": float(np.mean([item['y'] for item in historical_data])),
+                    "avg_historical_stock": float(y_mean),
                     "predicted_avg_forecast": float(np.mean(forecast_y)),
-                    "growth_rate": f"{(float(slope) / float(np.mean([item['y'] for item in historical_data])) * 100):.2f}%" if float(np.mean([item['y'] for item in historical_data])) > 0 else "0%",
+                    "growth_rate": f"{(float(slope) / float(y_mean) * 100):.2f}%" if y_mean > 0 else "0%",
                     "model_accuracy": "Medium (Linear Regression)",
                     "reorder_analysis": reorder_analysis
                 }